@@ -1,6 +1,11 @@
 from typing import Any, Dict, Optional
 
 
+def _is_blank(text: str, start: int, end: int) -> bool:
+    """Return True if text[start:end] is empty or whitespace only."""
+    return start == end or text[start:end].isspace()
+
+
 def validate_docstring(obj: Any) -> bool:
     """
     Validate if an object has a properly formatted docstring.
@@ -18,7 +23,7 @@ def validate_docstring(obj: Any) -> bool:
 
     Example:
         >>> def good_func():
-        ...     """Summary.\n\n    Extended description."""
+        ...     '''Summary.\\n\\n    Extended description.'''
         ...     pass
         >>> validate_docstring(good_func)
         True
@@ -27,39 +32,34 @@ def validate_docstring(obj: Any) -> bool:
     if not doc or not isinstance(doc, str) or not doc.strip():
         return False
     
-    lines = doc.strip().split('\n')
-    if not lines or not lines[0].strip():
-        return False
+    # Scan by index rather than splitting, so only the lines that are checked
+    # are ever looked at. The stripped text starts with a non-whitespace
+    # character, so the summary line is never empty.
+    stripped = doc.strip()
+    first_nl = stripped.find('\n')
+    if first_nl == -1:
+        return True
     
     # Check for proper multi-line structure if more than one line
-    if len(lines) > 1:
-        # Blank line after summary
-        if lines[1].strip():
-            return False
-        # Blank line before end if extended content
-        if len(lines) > 2 and not lines[-2].strip():
-            pass  # Good structure
-        elif len(lines) > 2:
-            return False
+    second_nl = stripped.find('\n', first_nl + 1)
+    if second_nl == -1:
+        # Exactly two lines: the second one ends the stripped text, so it
+        # cannot be the required blank line.
+        return False
+    # Blank line after summary
+    if not _is_blank(stripped, first_nl + 1, second_nl):
+        return False
+    # Blank line before end if extended content
+    last_nl = stripped.rfind('\n')
+    if not _is_blank(stripped, stripped.rfind('\n', 0, last_nl) + 1, last_nl):
+        return False
     
     return True
 
 
-def generate_template(kind: str = 'function') -> str:
-    """
-    Generate a standard docstring template for different Python objects.
-
-    Args:
-        kind: Type of object ('function', 'class', 'module')
-
-    Returns:
-        str: Formatted docstring template
-
-    Raises:
-        ValueError: If invalid kind specified
-    """
-    templates = {
-        'function': '''"""
+# Docstring templates by object kind, built once at import.
+_TEMPLATES = {
+    'function': '''"""
 {summary}
 
 Args:
@@ -75,7 +75,7 @@ Raises:
 Example:
     >>> result = my_function(arg1="value")
 """''',
-        'class': '''"""
+    'class': '''"""
 Class description.
 
 Attributes:
@@ -85,7 +85,7 @@ Methods:
     method1:
         Brief description.
 """''',
-        'module': '''"""
+    'module': '''"""
 Module description.
 
 Classes:
@@ -94,13 +94,26 @@ Classes:
 Functions:
 * my_function
 """'''
-    }
-    
-    template = templates.get(kind.lower())
-    if not template:
-        raise ValueError(f"Unsupported kind: {kind}. Use 'function', 'class', or 'module'")
-    
-    return template
+}
+
+
+def generate_template(kind: str = 'function') -> str:
+    """
+    Generate a standard docstring template for different Python objects.
+
+    Args:
+        kind: Type of object ('function', 'class', 'module')
+
+    Returns:
+        str: Formatted docstring template
+
+    Raises:
+        ValueError: If invalid kind specified
+    """
+    try:
+        return _TEMPLATES[kind.lower()]
+    except KeyError:
+        raise ValueError(f"Unsupported kind: {kind}. Use 'function', 'class', or 'module'") from None
 
 
 def add_missing_docs(func: callable) -> callable:
@@ -2,15 +2,25 @@ import time
 import logging
 import json
 import os
+import bisect
+import atexit
+import asyncio
 from typing import Dict, Any, List, Optional, Tuple
 from collections import namedtuple
+from functools import lru_cache
 from uuid import uuid4
 
 import requests
+from requests.adapters import HTTPAdapter
 from web3 import Web3
 from web3.types import LogReceipt
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError: # orjson is optional; fall back to the standard library json module.
+    orjson = None
+
 # --- Configuration & Setup ---
 
 load_dotenv()
@@ -26,6 +36,31 @@ logging.basicConfig(
 
 logger = logging.getLogger('CrossChainBridgeListener')
 
+# Write the state file indented (2 spaces) for debugging; compact JSON is used otherwise.
+PRETTY_STATE = os.getenv("BRIDGE_STATE_PRETTY", "").lower() in ("1", "true", "yes")
+
+def _dumps_state(state: Dict[str, Any]) -> bytes:
+    """Serializes the state to JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(state, option=orjson.OPT_INDENT_2 if PRETTY_STATE else 0)
+    if PRETTY_STATE:
+        return json.dumps(state, indent=2).encode()
+    return json.dumps(state, separators=(',', ':')).encode()
+
+def _fsync_dir(path: str) -> None:
+    """Flushes the directory entry for path to disk so that a rename into it is durable."""
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _loads_state(data: bytes) -> Dict[str, Any]:
+    """Parses state JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 # --- Mocks & Simulation Data ---
 
 # In a real scenario, this would be the actual ABI of the smart contract.
@@ -47,9 +82,56 @@ BRIDGE_CONTRACT_ABI = json.loads('''
 ]
 ''')
 
+# keccak256 of the DepositInitiated event signature, i.e. the expected topics[0].
+DEPOSIT_INITIATED_TOPIC = Web3.to_hex(Web3.keccak(text='DepositInitiated(address,address,uint256,uint256,uint64)'))
+
+# Decode DepositInitiated logs with the specialized fixed-layout decoder rather than
+# web3's generic ABI decoder. Set BRIDGE_WEB3_DECODER=1 to fall back to web3.
+USE_WEB3_DECODER = os.getenv("BRIDGE_WEB3_DECODER", "").lower() in ("1", "true", "yes")
+
+# A shared Web3 instance for offline utilities such as building contract objects.
+_W3 = Web3()
+
+@lru_cache(maxsize=None)
+def _get_bridge_contract(checksum_address: str):
+    """Builds the bridge contract object once per address and reuses it across handlers."""
+    return _W3.eth.contract(address=checksum_address, abi=BRIDGE_CONTRACT_ABI)
+
 # A simple named tuple to represent a structured event for easier access.
 DepositEvent = namedtuple('DepositEvent', ['sender', 'recipient', 'amount', 'destinationChainId', 'nonce', 'tx_hash', 'log_index'])
 
+def _to_hex_str(value: Any) -> str:
+    """Returns a 0x-prefixed hex string for values that may be str or bytes (e.g. HexBytes)."""
+    return value if isinstance(value, str) else Web3.to_hex(value)
+
+def decode_deposit_log(log: LogReceipt) -> DepositEvent:
+    """
+    Decodes a DepositInitiated log by reading its fixed layout directly:
+    sender and recipient are the indexed topics[1] and topics[2], and the data field
+    holds three 32-byte words for amount, destinationChainId and nonce.
+    Raises ValueError for any log the ABI decoder would also reject.
+    """
+    tx_hash = _to_hex_str(log['transactionHash'])
+    topics = [_to_hex_str(topic)[2:] for topic in log['topics']]
+    data = _to_hex_str(log['data'])[2:]
+    if len(topics) != 3 or any(len(topic) != 64 for topic in topics) or len(data) != 192:
+        raise ValueError(f"Unexpected DepositInitiated log layout in tx {tx_hash}")
+    # Addresses are left-padded with 12 zero bytes.
+    if topics[1][:24].strip('0') or topics[2][:24].strip('0'):
+        raise ValueError(f"Invalid address padding in DepositInitiated log in tx {tx_hash}")
+    nonce = int(data[128:192], 16)
+    if nonce >= 2 ** 64:
+        raise ValueError(f"DepositInitiated nonce out of uint64 range in tx {tx_hash}")
+    return DepositEvent(
+        sender=Web3.to_checksum_address('0x' + topics[1][24:]),
+        recipient=Web3.to_checksum_address('0x' + topics[2][24:]),
+        amount=int(data[0:64], 16),
+        destinationChainId=int(data[64:128], 16),
+        nonce=nonce,
+        tx_hash=tx_hash,
+        log_index=log['logIndex']
+    )
+
 class MockBlockchainConnector:
     """
     Mocks the connection to a blockchain node (e.g., via Web3.py).
@@ -61,13 +143,13 @@ class MockBlockchainConnector:
         self.rpc_url = rpc_url
         self.current_block = 0
         self.w3 = Web3() # Using Web3 for utilities like checksum addresses
-        logger.info(f"MockConnector for '{self.chain_name}' initialized at '{self.rpc_url}'.")
+        logger.info("MockConnector for '%s' initialized at '%s'.", self.chain_name, self.rpc_url)
 
     def get_latest_block_number(self) -> int:
         """Simulates fetching the latest block number."""
         # Increment block number slowly to simulate blockchain progression.
         self.current_block += 1
-        logger.debug(f"[{self.chain_name}] New block: {self.current_block}")
+        logger.debug("[%s] New block: %d", self.chain_name, self.current_block)
         return self.current_block
 
     def get_events(self, contract_address: str, from_block: int, to_block: int) -> List[LogReceipt]:
@@ -78,7 +160,7 @@ class MockBlockchainConnector:
         if from_block > to_block:
             return []
 
-        logger.info(f"[{self.chain_name}] Fetching events for contract {contract_address} from block {from_block} to {to_block}.")
+        logger.info("[%s] Fetching events for contract %s from block %d to %d.", self.chain_name, contract_address, from_block, to_block)
         
         # Simulate a new event appearing every few blocks.
         if self.current_block % 5 == 0:
@@ -86,10 +168,9 @@ class MockBlockchainConnector:
             mock_event: LogReceipt = {
                 'address': Web3.to_checksum_address(contract_address),
                 'topics': [
-                    # A realistic event signature hash for DepositInitiated(...)
-                    '0x' + 'a' * 64, 
-                    '0x' + 'b' * 64, # Mock sender
-                    '0x' + 'c' * 64  # Mock recipient
+                    DEPOSIT_INITIATED_TOPIC, # Event signature hash for DepositInitiated(...)
+                    '0x' + '0' * 24 + 'b' * 40, # Mock sender
+                    '0x' + '0' * 24 + 'c' * 40  # Mock recipient
                 ],
                 'data': '0x' + f'{1000000000000000000:064x}' + f'{97:064x}' + f'{self.current_block:064x}', # amount, destinationChainId, nonce
                 'blockNumber': self.current_block,
@@ -99,22 +180,22 @@ class MockBlockchainConnector:
                 'logIndex': 0,
                 'removed': False
             }
-            logger.info(f"[{self.chain_name}] Found 1 new mock event in block {self.current_block}.")
+            logger.info("[%s] Found 1 new mock event in block %d.", self.chain_name, self.current_block)
             return [mock_event]
         
         return []
 
-    def send_raw_transaction(self, raw_tx: str) -> str:
+    async def send_raw_transaction(self, raw_tx: str) -> str:
         """Simulates sending a signed transaction to the network."""
         tx_hash = f'0x{uuid4().hex}'
-        logger.info(f"[{self.chain_name}] Simulating transaction submission. TX_HASH: {tx_hash}")
-        # Simulate a short delay for transaction to be 'mined'.
-        time.sleep(1)
+        logger.info("[%s] Simulating transaction submission. TX_HASH: %s", self.chain_name, tx_hash)
+        # Simulate a short delay for transaction to be 'mined', without blocking other submissions.
+        await asyncio.sleep(1)
         return tx_hash
 
-    def get_transaction_receipt(self, tx_hash: str) -> Dict[str, Any]:
+    async def get_transaction_receipt(self, tx_hash: str) -> Dict[str, Any]:
         """Simulates fetching a transaction receipt to confirm it was successful."""
-        logger.info(f"[{self.chain_name}] Fetching receipt for {tx_hash}...")
+        logger.info("[%s] Fetching receipt for %s...", self.chain_name, tx_hash)
         return {
             'status': 1, # 1 for success, 0 for failure
             'blockNumber': self.get_latest_block_number() + 1,
@@ -127,100 +208,244 @@ class StateDB:
     This includes the last block processed and a list of completed transaction nonces
     to prevent double-spending or re-processing events.
     """
-    def __init__(self, db_path: str = 'state.json'):
+    def __init__(self, db_path: str = 'state.json', save_interval: float = 5.0, compact_every: int = 10000):
         self.db_path = db_path
+        # Completed nonces are appended to a line-per-nonce log as they happen and
+        # folded into the JSON snapshot once compact_every entries have accumulated.
+        # On compaction the log is rotated to '.log.bak', which together with the '.bak'
+        # snapshot covers every nonce should the new snapshot turn out unreadable.
+        self.nonce_log_path = self.db_path + '.log'
+        self._compact_every = compact_every
+        self._loaded_from_backup = False
         self.state = self._load()
+        if self._loaded_from_backup:
+            self._replay_nonce_log(self.nonce_log_path + '.bak')
+        self._nonce_log_entries = self._replay_nonce_log(self.nonce_log_path)
+        self._nonce_log = open(self.nonce_log_path, 'a', buffering=1)
+        # last_processed_block changes on every poll, so it lives in its own small file
+        # and the full snapshot is only rewritten on compaction. Block writes are
+        # throttled to at most once per save_interval seconds, plus once more on shutdown.
+        # Losing a recent block number only causes a rescan that the nonce check makes harmless.
+        self.block_path = self.db_path + '.block'
+        self.state['last_processed_block'] = max(self.state.get('last_processed_block', 0), self._load_block())
+        self._dirty = False
+        self._last_save = 0.0
+        self._save_interval = save_interval
+        atexit.register(self.flush)
+        # In-memory index of completed nonces for O(1) duplicate checks.
+        # The list in self.state is kept sorted as the persisted representation.
+        self.state['completed_nonces'].sort()
+        self._nonce_set = set(self.state['completed_nonces'])
 
     def _load(self) -> Dict[str, Any]:
-        """Loads state from a JSON file, or creates a default state if not found."""
+        """
+        Loads state from the JSON file, falling back to the backup copy if the
+        primary is missing or corrupt. Creates a default state if neither is usable.
+        """
+        for path in (self.db_path, self.db_path + '.bak'):
+            try:
+                with open(path, 'rb') as f:
+                    state = _loads_state(f.read())
+                logger.info("Loading state from %s", path)
+                self._loaded_from_backup = path != self.db_path
+                return state
+            except FileNotFoundError:
+                continue
+            except json.JSONDecodeError:
+                logger.warning("State file %s is corrupt.", path)
+        logger.warning("State file not found or invalid. Initializing new state.")
+        return {
+            'last_processed_block': 0,
+            'completed_nonces': []
+        }
+
+    def _replay_nonce_log(self, log_path: str) -> int:
+        """
+        Adds nonces recorded in an append-only nonce log to the loaded state.
+        Returns the number of entries in the log.
+        """
         try:
-            with open(self.db_path, 'r') as f:
-                logger.info(f"Loading state from {self.db_path}")
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            logger.warning(f"State file not found or invalid. Initializing new state.")
-            return {
-                'last_processed_block': 0,
-                'completed_nonces': []
-            }
+            with open(log_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return 0
+        complete_len = data.rfind(b'\n') + 1
+        if complete_len < len(data):
+            # A partially written last line from a crash; the nonce was never confirmed.
+            # Cut it off so the next append starts on a fresh line.
+            logger.warning("Discarding incomplete trailing entry in %s", log_path)
+            with open(log_path, 'r+b') as f:
+                f.truncate(complete_len)
+        entries = 0
+        for line in data[:complete_len].splitlines():
+            try:
+                nonce = int(line)
+            except ValueError:
+                logger.warning("Ignoring unparseable entry %r in %s", line, log_path)
+                continue
+            self.state['completed_nonces'].append(nonce)
+            entries += 1
+        if entries:
+            logger.info("Replayed %d nonces from %s", entries, log_path)
+            # Drop nonces that were already part of the snapshot.
+            self.state['completed_nonces'] = list(set(self.state['completed_nonces']))
+        return entries
+
+    def _load_block(self) -> int:
+        """Reads the last processed block from its own file, or 0 if it is missing or invalid."""
+        try:
+            with open(self.block_path, 'r') as f:
+                return int(f.read())
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def _save_block(self) -> None:
+        """Writes the last processed block to its own file via an atomic rename."""
+        tmp_path = self.block_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(str(self.state['last_processed_block']))
+        os.replace(tmp_path, self.block_path)
+        self._dirty = False
+        self._last_save = time.monotonic()
 
     def _save(self) -> None:
-        """Saves the current state to the JSON file."""
-        with open(self.db_path, 'w') as f:
-            json.dump(self.state, f, indent=4)
+        """
+        Saves the current state to the JSON snapshot, compacting the nonce log into it.
+        The state is written and fsynced to a temporary file which then atomically
+        replaces the primary, and the directory is fsynced, so neither a process
+        crash nor a power loss leaves a truncated state file.
+        The previous state is kept as a '.bak' copy. Since the snapshot now holds
+        every completed nonce, the nonce log is rotated to '.log.bak' afterwards;
+        it holds the nonces completed since the '.bak' snapshot.
+        """
+        tmp_path = self.db_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(_dumps_state(self.state))
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(self.db_path):
+            os.replace(self.db_path, self.db_path + '.bak')
+        os.replace(tmp_path, self.db_path)
+        _fsync_dir(self.db_path)
+        self._nonce_log.close()
+        os.replace(self.nonce_log_path, self.nonce_log_path + '.bak')
+        self._nonce_log = open(self.nonce_log_path, 'a', buffering=1)
+        _fsync_dir(self.nonce_log_path)
+        self._nonce_log_entries = 0
+
+    def _maybe_save(self) -> None:
+        """Marks the block as dirty and saves it if the save interval has elapsed."""
+        self._dirty = True
+        if time.monotonic() - self._last_save >= self._save_interval:
+            self._save_block()
+
+    def flush(self) -> None:
+        """Saves any pending block change immediately."""
+        if self._dirty:
+            self._save_block()
 
     def get_last_processed_block(self) -> int:
         return self.state.get('last_processed_block', 0)
 
     def set_last_processed_block(self, block_number: int) -> None:
         self.state['last_processed_block'] = block_number
-        self._save()
+        self._maybe_save()
 
     def is_nonce_processed(self, nonce: int) -> bool:
-        return nonce in self.state['completed_nonces']
+        return nonce in self._nonce_set
 
     def mark_nonce_as_processed(self, nonce: int) -> None:
-        if not self.is_nonce_processed(nonce):
-            self.state['completed_nonces'].append(nonce)
-            self.state['completed_nonces'].sort()
+        if self.is_nonce_processed(nonce):
+            return
+        self._nonce_set.add(nonce)
+        # Nonces arrive nearly in order, so a sorted insert is cheap.
+        bisect.insort(self.state['completed_nonces'], nonce)
+        # Persist just this nonce rather than rewriting the whole snapshot.
+        self._nonce_log.write(f"{nonce}\n")
+        os.fsync(self._nonce_log.fileno())
+        self._nonce_log_entries += 1
+        if self._nonce_log_entries >= self._compact_every:
             self._save()
-            logger.info(f"Nonce {nonce} marked as processed.")
+        logger.info("Nonce %d marked as processed.", nonce)
 
 class BridgeContractHandler:
     """
     An abstraction for interacting with the bridge smart contract on a specific chain.
     It uses a BlockchainConnector to communicate with the chain.
     """
-    def __init__(self, connector: MockBlockchainConnector, contract_address: str):
+    def __init__(self, connector: MockBlockchainConnector, contract_address: str, use_web3_decoder: bool = USE_WEB3_DECODER):
         self.connector = connector
+        self.use_web3_decoder = use_web3_decoder
         # Use Web3.py's contract object for easy event decoding
-        self.contract = Web3().eth.contract(address=Web3.to_checksum_address(contract_address), abi=BRIDGE_CONTRACT_ABI)
+        self.contract = _get_bridge_contract(Web3.to_checksum_address(contract_address))
+        # Build the event decoder once rather than per log.
+        self._process_log = self.contract.events.DepositInitiated().process_log
+        self._topic0 = DEPOSIT_INITIATED_TOPIC
         self.address = contract_address
-        logger.info(f"BridgeContractHandler initialized for contract {self.address} on chain '{self.connector.chain_name}'.")
+        logger.info("BridgeContractHandler initialized for contract %s on chain '%s'.", self.address, self.connector.chain_name)
 
     def get_deposit_events(self, from_block: int, to_block: int) -> List[DepositEvent]:
         """
         Fetches raw logs and decodes them into structured DepositEvent objects.
+        Errors are re-raised so the caller retries the range instead of skipping it.
         """
         try:
             raw_logs = self.connector.get_events(self.address, from_block, to_block)
             decoded_events = []
+            seen = set()
             for log in raw_logs:
-                # The Contract object can decode logs that match its ABI
-                event_data = self.contract.events.DepositInitiated().process_log(log)
-                decoded_events.append(
-                    DepositEvent(
-                        sender=event_data.args.sender,
-                        recipient=event_data.args.recipient,
-                        amount=event_data.args.amount,
-                        destinationChainId=event_data.args.destinationChainId,
-                        nonce=event_data.args.nonce,
-                        tx_hash=event_data.transactionHash.hex(),
-                        log_index=event_data.logIndex
+                # Skip logs invalidated by a reorg and duplicates within this response.
+                if log.get('removed'):
+                    continue
+                log_key = (log['blockHash'], log['transactionHash'], log['logIndex'])
+                if log_key in seen:
+                    continue
+                seen.add(log_key)
+                # Cheaply reject unrelated events before the comparatively costly ABI decode.
+                topics = log.get('topics')
+                if not topics:
+                    continue
+                if _to_hex_str(topics[0]).lower() != self._topic0:
+                    continue
+
+                if self.use_web3_decoder:
+                    # The Contract object can decode logs that match its ABI
+                    event_data = self._process_log(log)
+                    decoded_events.append(
+                        DepositEvent(
+                            sender=event_data.args.sender,
+                            recipient=event_data.args.recipient,
+                            amount=event_data.args.amount,
+                            destinationChainId=event_data.args.destinationChainId,
+                            nonce=event_data.args.nonce,
+                            tx_hash=_to_hex_str(event_data.transactionHash),
+                            log_index=event_data.logIndex
+                        )
                     )
-                )
+                else:
+                    decoded_events.append(decode_deposit_log(log))
             return decoded_events
         except Exception as e:
-            logger.error(f"[{self.connector.chain_name}] Failed to get or decode events: {e}")
-            return []
+            logger.error("[%s] Failed to get or decode events: %s", self.connector.chain_name, e)
+            raise
 
-    def execute_mint(self, event: DepositEvent) -> Optional[str]:
+    async def execute_mint(self, event: DepositEvent, gas_price: Optional[float] = None) -> Optional[str]:
         """
         Constructs and sends a transaction to mint tokens on the destination chain.
         In a real scenario, this would involve signing a transaction with a private key.
         """
         logger.info(
-            f"[{self.connector.chain_name}] Preparing mint transaction for nonce {event.nonce}. "
-            f"Recipient: {event.recipient}, Amount: {event.amount}"
+            "[%s] Preparing mint transaction for nonce %d. Recipient: %s, Amount: %d, Gas price: %s Gwei",
+            self.connector.chain_name, event.nonce, event.recipient, event.amount, gas_price
         )
         # In a real app, you'd use contract.functions.mint(...).build_transaction(...)
         # and then sign it with a private key.
         mock_raw_tx = f"signed_mint_tx_for_nonce_{event.nonce}"
         try:
-            tx_hash = self.connector.send_raw_transaction(mock_raw_tx)
+            tx_hash = await self.connector.send_raw_transaction(mock_raw_tx)
             return tx_hash
         except Exception as e:
-            logger.error(f"[{self.connector.chain_name}] Mint transaction failed to send: {e}")
+            logger.error("[%s] Mint transaction failed to send: %s", self.connector.chain_name, e)
             return None
 
 class EventProcessor:
@@ -239,69 +464,119 @@ class EventProcessor:
         self.state_db = state_db
         self.target_chain_id = target_chain_id # The chain ID this listener is responsible for
         self.poll_interval_seconds = 10
+        # The actual wait adapts between these bounds: it halves while events keep
+        # arriving and doubles while the chain is quiet.
+        self.min_poll_interval_seconds = 1
+        self.max_poll_interval_seconds = 60
+        self._cur_interval = self.poll_interval_seconds
         self.block_scan_range = 100 # Process up to 100 blocks at a time to not overload the RPC
+        # Reuse pooled keep-alive connections to the gas oracle across events.
+        self._http = requests.Session()
+        self._http.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+        # Gas prices don't meaningfully change between events, so cache them briefly.
+        self._gas_cache_ttl_seconds = 10
+        self._gas_cache: Tuple[float, float] = (0.0, 0.0) # (timestamp, value)
+        # Events in a batch have distinct nonces, so their mints can be submitted concurrently.
+        self.max_concurrent_mints = 8
 
     def _fetch_gas_price_from_oracle(self) -> float:
-        """Uses the requests library to fetch external data, e.g., a gas price oracle."""
+        """
+        Uses the requests library to fetch external data, e.g., a gas price oracle.
+        Successful results are cached for a short TTL to avoid a request per event.
+        """
+        fetched_at, cached_price = self._gas_cache
+        if fetched_at and time.monotonic() - fetched_at < self._gas_cache_ttl_seconds:
+            return cached_price
         try:
             # Using a public, free API for demonstration
-            response = requests.get('https://api.etherscan.io/api?module=gastracker&action=gasoracle&apikey=YourApiKeyToken')
+            response = self._http.get('https://api.etherscan.io/api?module=gastracker&action=gasoracle&apikey=YourApiKeyToken', timeout=3)
             response.raise_for_status()
             gas_data = response.json()
             propose_gas_price = float(gas_data['result']['ProposeGasPrice'])
-            logger.info(f"Fetched external gas price: {propose_gas_price} Gwei")
+            logger.info("Fetched external gas price: %s Gwei", propose_gas_price)
+            self._gas_cache = (time.monotonic(), propose_gas_price)
             return propose_gas_price
         except requests.exceptions.RequestException as e:
-            logger.warning(f"Could not fetch gas price from oracle: {e}. Using default value.")
+            logger.warning("Could not fetch gas price from oracle: %s. Using default value.", e)
             return 50.0  # Return a default value on failure
 
-    def process_single_event(self, event: DepositEvent) -> bool:
+    def _filter_pending_events(self, events: List[DepositEvent]) -> List[DepositEvent]:
+        """
+        Reduces a batch to the events this listener still has to act on:
+        those destined for the target chain whose nonce has not been processed yet.
+        Each nonce is kept at most once, so duplicate logs can never be minted twice.
+        """
+        pending = []
+        seen_nonces = set()
+        for event in events:
+            # Validation: Check if the event is destined for our target chain.
+            if event.destinationChainId != self.target_chain_id:
+                logger.debug("Skipping event (Nonce: %d, TX: %.10s...): destination chain is %d, not %d.",
+                             event.nonce, event.tx_hash, event.destinationChainId, self.target_chain_id)
+                continue
+            # State Check: Prevent re-processing completed events.
+            if self.state_db.is_nonce_processed(event.nonce):
+                logger.warning("Skipping event (Nonce: %d, TX: %.10s...): nonce has already been processed.",
+                               event.nonce, event.tx_hash)
+                continue
+            if event.nonce in seen_nonces:
+                logger.warning("Skipping event (Nonce: %d, TX: %.10s...): nonce appears more than once in this batch.",
+                               event.nonce, event.tx_hash)
+                continue
+            seen_nonces.add(event.nonce)
+            pending.append(event)
+        return pending
+
+    async def process_single_event(self, event: DepositEvent, gas_price: float) -> bool:
         """
-        Handles the logic for a single event, from validation to execution.
+        Handles the execution of a single, already validated event.
+        The gas price is fetched once per batch by the caller.
         Returns True if the event was processed successfully, False otherwise.
         """
         event_id = f"(Nonce: {event.nonce}, TX: {event.tx_hash[:10]}...)"
-        logger.info(f"Processing event {event_id}")
-
-        # 1. Validation: Check if the event is destined for our target chain.
-        if event.destinationChainId != self.target_chain_id:
-            logger.debug(f"Skipping event {event_id}: destination chain is {event.destinationChainId}, not {self.target_chain_id}.")
-            return True # Mark as processed successfully to not retry it
-
-        # 2. State Check: Prevent re-processing completed events.
-        if self.state_db.is_nonce_processed(event.nonce):
-            logger.warning(f"Skipping event {event_id}: nonce has already been processed.")
-            return True
-        
-        # 3. Simulate fetching external data required for the transaction.
-        self._fetch_gas_price_from_oracle()
+        logger.info("Processing event %s", event_id)
 
-        # 4. Execution: Submit the minting transaction on the destination chain.
-        mint_tx_hash = self.dest_handler.execute_mint(event)
+        # 1. Execution: Submit the minting transaction on the destination chain.
+        mint_tx_hash = await self.dest_handler.execute_mint(event, gas_price)
         if not mint_tx_hash:
-            logger.error(f"Failed to submit mint transaction for event {event_id}. Will retry later.")
+            logger.error("Failed to submit mint transaction for event %s. Will retry later.", event_id)
             return False
 
-        # 5. Confirmation: Wait for the transaction to be mined.
+        # 2. Confirmation: Wait for the transaction to be mined.
         # In a real system, this would have a more robust loop with timeouts and retries.
         try:
-            receipt = self.dest_handler.connector.get_transaction_receipt(mint_tx_hash)
+            receipt = await self.dest_handler.connector.get_transaction_receipt(mint_tx_hash)
             if receipt and receipt['status'] == 1:
-                logger.info(f"Successfully processed event {event_id}. Mint TX: {mint_tx_hash}")
-                # 6. State Update: Mark as complete only after successful confirmation.
+                logger.info("Successfully processed event %s. Mint TX: %s", event_id, mint_tx_hash)
+                # 3. State Update: Mark as complete only after successful confirmation.
                 self.state_db.mark_nonce_as_processed(event.nonce)
                 return True
             else:
-                logger.error(f"Mint transaction {mint_tx_hash} for event {event_id} failed on-chain (receipt status 0).")
+                logger.error("Mint transaction %s for event %s failed on-chain (receipt status 0).", mint_tx_hash, event_id)
                 return False
         except Exception as e:
-            logger.error(f"Error confirming transaction {mint_tx_hash}: {e}. Will retry later.")
+            logger.error("Error confirming transaction %s: %s. Will retry later.", mint_tx_hash, e)
             return False
 
-    def run(self) -> None:
+    def _next_poll_interval(self, found_events: bool) -> int:
+        """Adapts the polling interval to recent activity and returns the next wait in seconds."""
+        if found_events:
+            self._cur_interval = max(self.min_poll_interval_seconds, self._cur_interval // 2)
+        else:
+            self._cur_interval = min(self.max_poll_interval_seconds, self._cur_interval * 2)
+        return self._cur_interval
+
+    async def run(self) -> None:
         """The main execution loop of the listener."""
         logger.info("--- Cross-Chain Bridge Event Listener starting ---")
+        mint_slots = asyncio.Semaphore(self.max_concurrent_mints)
+
+        async def process_with_limit(event: DepositEvent, gas_price: float) -> bool:
+            async with mint_slots:
+                return await self.process_single_event(event, gas_price)
+
         while True:
+            events: List[DepositEvent] = []
             try:
                 # Determine the range of blocks to scan
                 last_processed_block = self.state_db.get_last_processed_block()
@@ -311,30 +586,45 @@ class EventProcessor:
                 to_block = min(latest_block, from_block + self.block_scan_range)
 
                 if from_block > latest_block:
-                    logger.info(f"No new blocks to process. Current head: {latest_block}. Waiting...")
-                    time.sleep(self.poll_interval_seconds)
+                    logger.info("No new blocks to process. Current head: %d. Waiting...", latest_block)
+                    await asyncio.sleep(self._next_poll_interval(found_events=False))
                     continue
 
                 # Fetch and process events
                 events = self.source_handler.get_deposit_events(from_block, to_block)
+                batch_succeeded = True
                 if events:
-                    logger.info(f"Found {len(events)} new deposit events between blocks {from_block} and {to_block}.")
-                    for event in sorted(events, key=lambda e: (e.nonce, e.log_index)): # Process in order
-                        success = self.process_single_event(event)
-                        if not success:
-                            # If any event fails, stop processing this batch and retry from the same
-                            # starting block in the next iteration. This ensures events are processed in order.
-                            logger.error(f"Halting current batch due to processing failure. Will retry from block {from_block}.")
-                            break
-                
+                    logger.info("Found %d new deposit events between blocks %d and %d.", len(events), from_block, to_block)
+                    pending = self._filter_pending_events(events)
+                    if pending:
+                        # Fetch external data once for the whole batch.
+                        gas_price = self._fetch_gas_price_from_oracle()
+                        # Logs usually arrive already ordered, which makes this sort a linear pass.
+                        if len(pending) > 1:
+                            pending.sort(key=lambda e: (e.nonce, e.log_index))
+                        # Each successful event marks its own nonce, so only failed ones remain pending.
+                        results = await asyncio.gather(*(
+                            process_with_limit(event, gas_price) for event in pending # Submit in order
+                        ), return_exceptions=True)
+                        for event, result in zip(pending, results):
+                            if isinstance(result, Exception):
+                                logger.error("Unexpected error processing event (Nonce: %d, TX: %.10s...): %s",
+                                             event.nonce, event.tx_hash, result, exc_info=result)
+                        batch_succeeded = all(result is True for result in results)
+                        if not batch_succeeded:
+                            # If any event fails, retry from the same starting block in the next iteration.
+                            # Events that already succeeded are skipped by the nonce check.
+                            logger.error("Batch had processing failures. Will retry from block %d.", from_block)
+
                 # If all events in the range were processed successfully, update the state.
-                self.state_db.set_last_processed_block(to_block)
-                logger.debug(f"Successfully scanned up to block {to_block}. State updated.")
+                if batch_succeeded:
+                    self.state_db.set_last_processed_block(to_block)
+                    logger.debug("Successfully scanned up to block %d. State updated.", to_block)
 
             except Exception as e:
-                logger.critical(f"An unexpected error occurred in the main loop: {e}", exc_info=True)
+                logger.critical("An unexpected error occurred in the main loop: %s", e, exc_info=True)
             
-            time.sleep(self.poll_interval_seconds)
+            await asyncio.sleep(self._next_poll_interval(found_events=bool(events)))
 
 if __name__ == '__main__':
     # --- Main Execution --- 
@@ -363,4 +653,4 @@ if __name__ == '__main__':
         target_chain_id=DESTINATION_CHAIN_ID_TO_LISTEN_FOR
     )
 
-    processor.run()
+    asyncio.run(processor.run())